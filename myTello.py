@@ -4,6 +4,7 @@ import logging
 from djitellopy import Tello
 from djitellopy.enforce_types import enforce_types
 from CameraLib.faceTracking import FaceTracker
+from photoCapture import PhotoCapture
 from IotLib.log import Log
 from IotLib.pyUtils import timestamp, startThread
 try:
@@ -17,7 +18,8 @@ class MyTello(Tello):
     ''' override Tello '''
     def __init__(self, host=Tello.TELLO_IP, retry_count=Tello.RETRY_COUNT, log_level=logging.INFO,
                 commandCallback = None, postCmdCallback = None, videoSize = (960, 720), videoPosition = None,
-                videoStamping = False, faceClassifierFile=''):
+                videoStamping = False, faceClassifierFile='', photoFolder = '', photoFormat = 'jpg', photoQuality = 90,
+                photoWorkers = 2, photoMetadata = True):
         Tello.LOGGER.setLevel(log_level)	# logging.DEBUG logging.WARNING logging.INFO
         super(MyTello, self).__init__(host, retry_count)
         self._videoWorkerThread = None
@@ -34,6 +36,8 @@ class MyTello(Tello):
         self.latestCommand = ''
         self.commandCallback = commandCallback
         self.postCmdCallback = postCmdCallback
+        self.photoCapture = PhotoCapture(self, folder=photoFolder, format=photoFormat, quality=photoQuality,
+                                         workers=photoWorkers, metadata=photoMetadata)
 
     def connect(self, wait_for_state=True):
         """ override connect (enter SDK mode) to log battery status """
@@ -134,6 +138,7 @@ class MyTello(Tello):
 
     def end(self):
         """ override end method to stop video recording if still running """
+        self.photoCapture.close()
         self.stopVideo()
         super(MyTello, self).end()
 
@@ -142,31 +147,39 @@ class MyTello(Tello):
         self.videoSize = videoSize
         self.videoPosition = videoPosition
 
-    def takePicture(self, fileName):
-        ''' take a picture and save to a png file '''
+    def takePicture(self, fileName = None):
+        ''' take a picture and queue it to be saved (format by file extension) without waiting. default file name is the current time '''
         if cv2Ok:
+            fileName = self.photoCapture.fileName(fileName)
             cmd = 'Save picture to %s' %fileName
             self._logCommand(cmd)
+            return self.photoCapture.takePicture(fileName, cmd)
+        return False
 
-            try:
-                if self.videoFrame is not None and self._videoWorkerThread != None:
-                    # use self.videoFrame if available and up to date
-                    frame = self.videoFrame
-                else:
-                    if not self.stream_on:
-                        self.streamon()
-
-                    frame = self.get_frame_read().frame
-
-                # write to file
-                cv2.imwrite(fileName, frame)
-
-                self._logCommandResult(cmd, 'Saved' )
-                return True
-            except Exception as e:
-                self._logException('Saving picture to %s' %fileName, e)
+    def burst(self, count, interval):
+        ''' take count pictures interval seconds apart. returns after all pictures are saved '''
+        if cv2Ok:
+            return self.photoCapture.burst(count, interval) > 0
         return False
 
+    def startOrStopTimelapseAsync(self, count = 0, interval = 1.0):
+        ''' start/stop taking pictures every interval seconds (count 0 for until stopped) '''
+        if not self.photoCapture.isTimelapseRunning():
+            if cv2Ok:
+                self.photoCapture.startTimelapse(count, interval)
+        else:
+            self.photoCapture.stopTimelapse()
+            self._logCommand('Stopped timelapse')
+
+    def getFrame(self):
+        ''' get the latest video frame '''
+        if self.videoFrame is not None and self._videoWorkerThread != None:
+            # use self.videoFrame if available and up to date
+            return self.videoFrame
+        if not self.stream_on:
+            self.streamon()
+        return self.get_frame_read().frame
+
     def startOrStopStreamVideoAsync(self):
         """ streaming video in an open cv window """
         if not self.streamingVideo:
@@ -329,8 +342,13 @@ class MyTello(Tello):
                 if not self.is_flying:
                     ok = False
             elif 'p' == msg or 'photo' == msg:
-                fileName = '%s.png' %timestamp()
-                self.takePicture(fileName)
+                ok = self.takePicture()
+            elif msg.startswith('burst'):
+                count, interval = self._getValues(cmdstr, ('10', '0.2'))
+                ok = self.burst(int(count), float(interval))
+            elif msg.startswith('timelapse'):
+                count, interval = self._getValues(cmdstr, ('0', '1.0'))
+                self.startOrStopTimelapseAsync(int(count), float(interval))
             elif 'v' == msg or 'video' == msg:
                 fileName = '%s.avi' %timestamp()
                 self.startOrStopSaveVideoAsync(fileName)
@@ -363,3 +381,8 @@ class MyTello(Tello):
         except:
             return default
 
+    def _getValues(self, cmdstr, defaults):
+        ''' get multiple command values from the str. missing values are taken from defaults '''
+        values = cmdstr.split()[1:]
+        return tuple(values[i] if i < len(values) else defaults[i] for i in range(len(defaults)))
+
@@ -0,0 +1,251 @@
+import os
+import time
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from IotLib.log import Log
+from IotLib.pyUtils import timestamp, startThread
+
+class PhotoCapture(object):
+    """ capture photos (single, burst, timelapse) from a MyTello and encode/save them on a bounded worker pool.
+    cv2 is imported when saving since MyTello only calls this when cv2 is available. """
+    Formats = ('jpg', 'png', 'npy')
+
+    def __init__(self, tello, folder='', format='jpg', quality=90, workers=2, maxPending=8, metadata=True):
+        self.tello = tello
+        self.folder = folder
+        self.format = self._normalizeFormat(format)
+        self.quality = quality          # jpg quality 0-100 (png compression is derived from it)
+        self.metadata = metadata        # whether to write a .json telemetry sidecar for each photo
+        self.workers = max(1, workers)
+        self._executor = None           # created on first use and again after close()
+        # bounds the number of frames waiting to be encoded (each 960x720 frame is ~2MB)
+        self._pending = threading.BoundedSemaphore(max(1, maxPending))
+        self._timelapseStop = None      # threading.Event to stop/wake the current timelapse
+        self._lock = threading.Lock()
+        self._series = set()            # stop events of the running bursts and timelapses
+        self._seriesDone = threading.Condition(self._lock)
+        self._sequence = 0              # makes default file names unique within the same second
+        self.savedCount = 0
+        self.errorCount = 0
+        self.droppedCount = 0
+
+    def fileName(self, fileName=None):
+        """ returns fileName or a new unique file name with the current time in self.folder """
+        if fileName:
+            return fileName
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        return os.path.join(self.folder, '%s-%04i.%s' %(timestamp(), sequence % 10000, self.format))
+
+    def takePicture(self, fileName=None, cmd=None):
+        """ queue a picture to be taken and saved without blocking. returns False when dropped.
+        cmd is the logged command that gets the Saved result """
+        fileName = self.fileName(fileName)
+        if not self._pending.acquire(blocking=False):
+            with self._lock:
+                self.droppedCount += 1
+            self.tello._logCommandResult(cmd or 'Save picture to %s' %fileName, 'Dropped (too many pending photos)')
+            return False
+        try:
+            future = self._getExecutor().submit(self._captureAndSave, fileName, cmd)
+        except Exception as e:
+            self._pending.release()
+            self.tello._logException('Saving picture to %s' %fileName, e)
+            return False
+        future.add_done_callback(lambda f: self._pending.release())
+        return True
+
+    def burst(self, count, interval):
+        """ capture count photos interval seconds apart. returns the number of photos saved """
+        if count < 1:
+            self.tello._logCommandResult('Burst %i photos' %count, 'Invalid count')
+            return 0
+        self.tello._logCommand('Burst %i photos every %.2f seconds' %(count, interval))
+        stopEvent = self._addSeries()
+        return self._runSeries('%s-burst' %timestamp(), 'Burst', count, interval, stopEvent)
+
+    def isTimelapseRunning(self):
+        """ whether a timelapse is running and not being stopped """
+        with self._lock:
+            return self._timelapseStop in self._series and not self._timelapseStop.is_set()
+
+    def startTimelapse(self, count, interval):
+        """ capture count photos (0 for until stopped) interval seconds apart in a separate thread """
+        with self._lock:
+            if self._timelapseStop in self._series and not self._timelapseStop.is_set():
+                return False
+            # a stopped timelapse may still be saving; it stays in self._series until done so close() waits for it
+            stopEvent = threading.Event()
+            self._series.add(stopEvent)
+            self._timelapseStop = stopEvent
+        startThread(context='Timelapse', target=self._timelapseWorker, front=True, args=(count, interval, stopEvent))
+        return True
+
+    def stopTimelapse(self):
+        """ signal the timelapse to stop without waiting for it """
+        with self._lock:
+            if self._timelapseStop is not None:
+                self._timelapseStop.set()
+
+    def close(self):
+        """ stop bursts and timelapses and wait for all queued photos to be saved. photos can still be taken after close """
+        with self._lock:
+            for stopEvent in self._series:
+                stopEvent.set()
+            while len(self._series) > 0:
+                self._seriesDone.wait()
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _getExecutor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='PhotoEncoder')
+            return self._executor
+
+    def _timelapseWorker(self, count, interval, stopEvent):
+        self.tello._logCommand('Start timelapse every %.2f seconds' %interval)
+        self._runSeries('%s-timelapse' %timestamp(), 'Timelapse', count, interval, stopEvent)
+
+    def _addSeries(self):
+        """ returns a new stop event registered so close() can stop the series """
+        stopEvent = threading.Event()
+        with self._lock:
+            self._series.add(stopEvent)
+        return stopEvent
+
+    def _runSeries(self, name, context, count, interval, stopEvent):
+        """ capture the series, wait for the photos to be saved and log the rate. returns the number saved """
+        try:
+            startTime = time.time()
+            futures = self._captureSeries(name, context.lower(), count, interval, stopEvent)
+            return self._waitAndLogRate(context, futures, startTime)
+        finally:
+            with self._lock:
+                self._series.discard(stopEvent)
+                self._seriesDone.notify_all()
+
+    def _captureSeries(self, name, mode, count, interval, stopEvent):
+        """ capture frames on a fixed schedule so slow encoding does not stretch the interval """
+        futures = []
+        nextTime = time.time()
+        index = 0
+        while not stopEvent.is_set():
+            index += 1
+            fileName = os.path.join(self.folder, '%s-%04i.%s' %(name, index, self.format))
+            future = self._capture(fileName, mode, index, stopEvent)
+            if future is not None:
+                futures.append(future)
+            if count > 0 and index >= count:
+                break
+            nextTime += interval
+            delay = nextTime - time.time()
+            if delay > 0:
+                stopEvent.wait(delay)
+        return futures
+
+    def _capture(self, fileName, mode, index, stopEvent):
+        """ grab the current frame and queue it for saving. waits while too many frames are pending """
+        try:
+            frame = self._getFrame()
+            info = self._telemetry(mode, index, frame) if self.metadata else None
+            # wait for a free slot so memory stays bounded but still wake up on stop
+            while not self._pending.acquire(timeout=0.1):
+                if stopEvent.is_set():
+                    return None
+            try:
+                future = self._getExecutor().submit(self._save, fileName, frame, info, None)
+            except:
+                self._pending.release()
+                raise
+            future.add_done_callback(lambda f: self._pending.release())
+            return future
+        except Exception as e:
+            self.tello._logException('Capturing picture %s' %fileName, e)
+            return None
+
+    def _captureAndSave(self, fileName, cmd):
+        """ grab the current frame and save it (runs on the worker pool) """
+        try:
+            frame = self._getFrame()
+        except Exception as e:
+            with self._lock:
+                self.errorCount += 1
+            self.tello._logException('Capturing picture %s' %fileName, e)
+            return False
+        info = self._telemetry('photo', 0, frame) if self.metadata else None
+        return self._save(fileName, frame, info, cmd)
+
+    def _getFrame(self):
+        frame = self.tello.getFrame()
+        if frame is None:
+            raise Exception('no video frame')
+        # copy since the video worker may stamp text on the same frame
+        return frame.copy()
+
+    def _save(self, fileName, frame, info, cmd):
+        """ encode and write frame (runs on the worker pool). returns True when saved """
+        try:
+            format = self._normalizeFormat(os.path.splitext(fileName)[1][1:], self.format)
+            if format == 'npy':
+                import numpy
+                numpy.save(fileName, frame)
+            else:
+                import cv2
+                if format == 'png':
+                    compression = min(9, max(0, (100 - self.quality) * 9 // 100))
+                    ok = cv2.imwrite(fileName, frame, [cv2.IMWRITE_PNG_COMPRESSION, compression])
+                else:
+                    ok = cv2.imwrite(fileName, frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+                if not ok: raise Exception('cv2.imwrite failed')
+            if info is not None:
+                with open(os.path.splitext(fileName)[0] + '.json', 'w') as file:
+                    json.dump(info, file, indent=2)
+            with self._lock:
+                self.savedCount += 1
+            if cmd is not None:
+                self.tello._logCommandResult(cmd, 'Saved')
+            else:
+                Log.info('Saved picture to %s' %fileName)
+            return True
+        except Exception as e:
+            with self._lock:
+                self.errorCount += 1
+            self.tello._logException('Saving picture to %s' %fileName, e)
+            return False
+
+    def _telemetry(self, mode, index, frame):
+        """ telemetry at capture time for the metadata sidecar """
+        height, width = frame.shape[:2]
+        info = {'time': time.time(), 'timestamp': timestamp(), 'mode': mode, 'index': index,
+                'width': width, 'height': height, 'command': self.tello.latestCommand}
+        try:
+            info['state'] = dict(self.tello.get_current_state())
+        except:
+            info['state'] = {}
+        return info
+
+    def _waitAndLogRate(self, context, futures, startTime):
+        """ wait for the photos to be saved and log the saved photos per second from the first capture
+        to the last save. returns the number saved """
+        wait(futures)
+        seconds = time.time() - startTime
+        saved = sum(1 for f in futures if f.result())
+        errors = len(futures) - saved
+        rate = saved / seconds if seconds > 0 else 0.0
+        self.tello._logCommandResult('%s %i photos' %(context, saved), '%.2f seconds (%.2f photos/sec)' %(seconds, rate))
+        if errors > 0:
+            self.tello._logCommandResult(context, '%i photos failed' %errors)
+        return saved
+
+    def _normalizeFormat(self, format, default='jpg'):
+        format = format.lower().lstrip('.')
+        if format == 'jpeg':
+            format = 'jpg'
+        if format not in PhotoCapture.Formats:
+            return default
+        return format
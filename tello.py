@@ -22,6 +22,10 @@ class MainWidget(BoxLayout):
         self.runCmdDelay = config.getOrAddFloat('DelayForContinuousCommands', 0)
         self.defaultPhotoFolder = config.getOrAdd('DefaultPhotoFolder', '')
         self.defaultVideoFolder = config.getOrAdd('DefaultVideoFolder', '')
+        self.photoFormat = config.getOrAdd('Photo.Format', 'jpg')
+        self.photoQuality = config.getOrAddInt('Photo.Quality', 90)
+        self.photoWorkers = config.getOrAddInt('Photo.Workers', 2)
+        self.photoMetadata = config.getOrAddBool('Photo.Metadata', True)
         self.statusUpdateInterval = config.getOrAddFloat('StatusUpdateInterval', 5.0)
         self.videoClassifier = config.getOrAdd('Video.Classifier', 'haarcascade_frontalface_alt.xml')
         self.videoStreaming = config.getOrAddBool('Video.Streaming', False)
@@ -34,7 +38,9 @@ class MainWidget(BoxLayout):
         self.videoHeight = int(self.ids.HeightInput.text)
         # create MyTello (logging options: logging.DEBUG logging.WARNING logging.INFO)
         self.tello = MyTello(log_level=logging.WARNING, videoStamping = self.videoStamping,
-                            commandCallback = self._showCommand, postCmdCallback = self._showCommandResult, faceClassifierFile = self.videoClassifier)
+                            commandCallback = self._showCommand, postCmdCallback = self._showCommandResult, faceClassifierFile = self.videoClassifier,
+                            photoFolder = self.defaultPhotoFolder, photoFormat = self.photoFormat, photoQuality = self.photoQuality,
+                            photoWorkers = self.photoWorkers, photoMetadata = self.photoMetadata)
         self._setVideoSizePosition()
 
         # init the command dictionary
@@ -108,10 +114,16 @@ class MainWidget(BoxLayout):
         self._commands.pop(cmd, None)
 
     def takePictureAsync(self):
-        """ take a picture and save to file with current time as file name """
-        fileName = '%s.png' %timestamp()
-        fileName = os.path.join(self.defaultPhotoFolder, fileName)
-        startThread(context='Save photo to file: %s' %fileName, target=self.tello.takePicture, front=True, args=(fileName,))
+        """ take a picture and save to file with current time as file name (saved by the photo worker pool) """
+        self.tello.takePicture()
+
+    def burstAsync(self, count, interval):
+        """ take count pictures interval seconds apart in a separate thread """
+        startThread(context='Burst %i photos' %count, target=self.tello.burst, front=True, args=(count, interval))
+
+    def startOrStopTimelapseAsync(self, interval):
+        """ start/stop taking a picture every interval seconds """
+        self.tello.startOrStopTimelapseAsync(0, interval)
 
     def startOrStopStreamVideoAsync(self):
         """ start/stop video streaming in separate window """
@@ -195,6 +207,9 @@ class MainWidget(BoxLayout):
                         else: self.ids.StreamButton.background_color = (1, 1, 1, 1)
                         if self.tello.faceTracking: self.ids.FaceTrackButton.background_color = (0, 1, 0, 1)
                         else: self.ids.FaceTrackButton.background_color = (1, 1, 1, 1)
+                    if 'TimelapseButton' in self.ids:
+                        if self.tello.photoCapture.isTimelapseRunning(): self.ids.TimelapseButton.background_color = (0, 1, 0, 1)
+                        else: self.ids.TimelapseButton.background_color = (1, 1, 1, 1)
                 else:
                     self.ids.ConnectButton.background_color = (1, 1, 1, 1)
                     self.ids.StatusLabel.text = 'Not Connected'
@@ -206,6 +221,8 @@ class MainWidget(BoxLayout):
                         self.ids.VideoButton.background_color = (1, 1, 1, 1)
                         self.ids.StreamButton.background_color = (1, 1, 1, 1)
                         self.ids.FaceTrackButton.background_color = (1, 1, 1, 1)
+                    if 'TimelapseButton' in self.ids:
+                        self.ids.TimelapseButton.background_color = (1, 1, 1, 1)
             except:
                 pass
             time.sleep(self.statusUpdateInterval)
@@ -10,7 +10,9 @@ def help():
     print ('  0 - takeoff')
     print ('  1 - land')
     print ('  2 - end and exit')
-    print ('  p[hoto]     - take a picture and save to file (yyyy-mmdd-hhmmss.png)')
+    print ('  p[hoto]     - take a picture and save to file (yyyy-mmdd-hhmmss-nnnn.jpg)')
+    print ('  burst <n> <sec>     - take n pictures sec seconds apart (default: 10 0.2)')
+    print ('  timelapse <n> <sec> - start/stop taking n pictures (0 until stopped) every sec seconds (default: 0 1.0)')
     print ('  v[ideo]     - start/stop video recording and save to file (yyyy-mmdd-hhmmss.avi)')
     print ('  run <file>  - load and execute commands from file (default: telloCommands.txt)')
     print ('  sleep <sec> - sleep in seconds (default: 1.0)')
@@ -46,7 +48,7 @@ tello = MyTello(log_level=logging.WARNING)	# logging.DEBUG logging.WARNING loggi
 tello.connect(wait_for_state=True)
 while True:
     try:
-        msg0 = input("0-takeoff, 1-land, 2-end, run, photo, video, sleep, or just type tello commands? ");
+        msg0 = input("0-takeoff, 1-land, 2-end, run, photo, burst, timelapse, video, sleep, or just type tello commands? ");
         if not msg0:
             Log.info ('bye ...')
             break